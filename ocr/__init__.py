@@ -0,0 +1,34 @@
+"""
+ABY book pipeline: OCR, translation, parsing and assembly
+
+Submodules are loaded lazily, so `import ocr` stays cheap and side-effect free.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'GeminiConfig': 'gemini',
+    'GeminiClient': 'gemini',
+    'arabic_to_int': 'parsing',
+    'parse_paragraphs': 'parsing',
+    'group_unit_images': 'aby_t3_ocr',
+    'ocr_unit': 'aby_t3_ocr',
+    'translate_unit': 'aby_t3_ocr',
+    'process_unit': 'aby_t3_ocr',
+    'load_units': 'aby_t3_ocr',
+    'save_unit': 'aby_t3_ocr',
+    'build_book_json': 'aby_t3_ocr',
+    'clean_book': 'clean_tahyia',
+    'clean_tahyia_from_item': 'clean_tahyia',
+    'convert_aby_t1': 'convert_to_universal',
+    'convert_aby_t2_t3': 'convert_to_universal',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Precompute tajweed-annotated verses for the Quran module
+- Joins cpfair/quran-tajweed annotations with the Uthmani text
+- Validates annotation offsets against the text
+- Emits one shard per surah with per-word tajweed HTML already resolved
+
+Run with: python -m ocr tajweed path/to/tajweed-cpfair.json
+
+Shard format (public/quran-tajweed/<surah>.json):
+    {"surah": 2, "ayahs": [{"t": "<verse text>", "w": [null, "<span class=\"tj-ikhfa\">...</span>", ...]}, ...]}
+`t` is the verse with words separated by single spaces, `w` holds one entry
+per word (null when the word has no tajweed markup). Verses without
+annotations have no `w` key.
+"""
+
+import re
+import json
+import gzip
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_TEXT_PATH = ROOT_DIR / 'src' / 'modules' / 'quran' / 'data' / 'quran-uthmani.txt'
+DEFAULT_OUTPUT_DIR = ROOT_DIR / 'public' / 'quran-tajweed'
+
+SURAH_COUNT = 114
+VERSE_COUNT = 6236
+
+# cpfair rule name -> CSS class (colors live in index.css .tj-* rules);
+# keep in sync with TAJWEED_RULES in tajweed.js
+TAJWEED_RULES = {
+    'hamzat_wasl': 'hamzat_wasl',
+    'lam_shamsiyyah': 'lam_shamsiyyah',
+    'silent': 'silent',
+    'madd_2': 'madd_normal',
+    'madd_246': 'madd_permissible',
+    'madd_muttasil': 'madd_muttasil',
+    'madd_munfasil': 'madd_munfasil',
+    'madd_6': 'madd_necessary',
+    'qalqalah': 'qalqalah',
+    'ghunnah': 'ghunnah',
+    'ikhfa': 'ikhfa',
+    'ikhfa_shafawi': 'ikhfa_shafawi',
+    'idghaam_ghunnah': 'idghaam_ghunnah',
+    'idghaam_no_ghunnah': 'idghaam_no_ghunnah',
+    'idghaam_shafawi': 'idghaam_shafawi',
+    'idghaam_mutajanisayn': 'idghaam_mutajanisayn',
+    'idghaam_mutaqaribayn': 'idghaam_mutaqaribayn',
+    'iqlab': 'iqlab',
+}
+
+
+def load_quran_text(text_path):
+    """Parse the Tanzil "surah|ayah|text" file into {(surah, ayah): text}"""
+    verses = {}
+    with open(text_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            parts = line.split('|')
+            if len(parts) >= 3:
+                verses[(int(parts[0]), int(parts[1]))] = '|'.join(parts[2:]).strip()
+    return verses
+
+
+def load_annotations(annotations_path):
+    """Load cpfair annotations into {(surah, ayah): [{rule, start, end}]}"""
+    with open(annotations_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {(item['surah'], item['ayah']): item.get('annotations') or [] for item in data}
+
+
+def validate(verses, annotations):
+    """Check annotations against the text; returns (errors, warnings)"""
+    errors = []
+    unknown_rules = {}
+    whitespace_only = 0
+
+    if len(verses) != VERSE_COUNT:
+        errors.append(f"text has {len(verses)} verses, expected {VERSE_COUNT}")
+
+    for key, anns in annotations.items():
+        ref = f"{key[0]}:{key[1]}"
+        text = verses.get(key)
+        if text is None:
+            errors.append(f"{ref}: annotated verse missing from text")
+            continue
+
+        for ann in anns:
+            if not 0 <= ann['start'] < ann['end'] <= len(text):
+                errors.append(f"{ref}: {ann['rule']} [{ann['start']}, {ann['end']}) "
+                              f"outside verse of length {len(text)}")
+            elif text[ann['start']:ann['end']].isspace():
+                whitespace_only += 1
+            if ann['rule'] not in TAJWEED_RULES:
+                unknown_rules[ann['rule']] = unknown_rules.get(ann['rule'], 0) + 1
+
+    warnings = [f"unknown rule {rule!r} on {count} annotations (ignored)"
+                for rule, count in sorted(unknown_rules.items())]
+    if whitespace_only:
+        warnings.append(f"{whitespace_only} annotations cover only whitespace (ignored)")
+    missing = len(set(verses) - set(annotations))
+    if missing:
+        warnings.append(f"{missing} verses have no annotations")
+
+    return errors, warnings
+
+
+def apply_tajweed(text, annotations):
+    """Wrap annotated ranges of text in spans (same splicing as the old client-side applyTajweedToText)"""
+    if not annotations:
+        return text
+
+    # Apply from end to start so earlier offsets stay valid
+    chars = list(text)
+    for ann in sorted(annotations, key=lambda a: -a['start']):
+        css_class = TAJWEED_RULES.get(ann['rule'])
+        if not css_class:
+            continue
+
+        start, end = ann['start'], ann['end']
+        if start >= 0 and end <= len(chars) and start < end:
+            segment = ''.join(chars[start:end])
+            chars[start:end] = [f'<span class="tj-{css_class}">{segment}</span>']
+
+    return ''.join(chars)
+
+
+def resolve_words(text, annotations):
+    """Split a verse into words and resolve each word's tajweed HTML"""
+    words = []
+    html = []
+    for match in re.finditer(r'\S+', text):
+        word_start, word_end = match.span()
+        word = match.group()
+
+        # Clip annotations overlapping this word to word-local offsets
+        word_anns = [{
+            'rule': ann['rule'],
+            'start': max(0, ann['start'] - word_start),
+            'end': min(len(word), ann['end'] - word_start)
+        } for ann in annotations if ann['start'] < word_end and ann['end'] > word_start]
+
+        words.append(word)
+        word_html = apply_tajweed(word, word_anns)
+        html.append(word_html if word_html != word else None)
+
+    return ' '.join(words), html
+
+
+def build_shards(verses, annotations):
+    """Group resolved verses into {surah: shard}"""
+    shards = {}
+    for (surah, ayah) in sorted(verses):
+        shard = shards.setdefault(surah, {'surah': surah, 'ayahs': []})
+        if len(shard['ayahs']) != ayah - 1:
+            raise ValueError(f"{surah}:{ayah}: verses are not contiguous")
+
+        anns = annotations.get((surah, ayah))
+        if anns is None:
+            shard['ayahs'].append({'t': ' '.join(verses[(surah, ayah)].split())})
+        else:
+            text, html = resolve_words(verses[(surah, ayah)], anns)
+            shard['ayahs'].append({'t': text, 'w': html})
+    return shards
+
+
+def write_shards(shards, output_dir):
+    """Write compact shards; returns {surah: serialized bytes}"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    written = {}
+    for surah, shard in shards.items():
+        data = json.dumps(shard, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        (output_dir / f"{surah}.json").write_bytes(data)
+        written[surah] = data
+    return written
+
+
+def _kb(size):
+    return f"{size / 1024:,.1f} KB"
+
+
+def report(annotations_path, text_path, written):
+    """Print bundle-size and startup-parse comparison (Python timings as a proxy)"""
+    before = Path(annotations_path).read_bytes() + Path(text_path).read_bytes()
+    sizes = sorted(len(data) for data in written.values())
+    gz_sizes = sorted(len(gzip.compress(data)) for data in written.values())
+    median_size = sizes[len(sizes) // 2]
+    median = next(data for data in written.values() if len(data) == median_size)
+
+    # Old startup: parse the whole annotation file + index all text lines
+    t0 = time.perf_counter()
+    load_annotations(annotations_path)
+    load_quran_text(text_path)
+    startup_before = (time.perf_counter() - t0) * 1000
+
+    # New: nothing at startup, one median shard parsed when its surah is shown
+    t0 = time.perf_counter()
+    json.loads(median)
+    startup_after = (time.perf_counter() - t0) * 1000
+
+    print("\n📦 Bundle size")
+    print(f"  Before: {_kb(len(before))} ({_kb(len(gzip.compress(before)))} gzip) in the client bundle")
+    print(f"  After:  0 KB in the bundle; {len(sizes)} shards, {_kb(sum(sizes))} total "
+          f"({_kb(sum(gz_sizes))} gzip)")
+    print(f"          per surah: median {_kb(median_size)}, max {_kb(sizes[-1])} "
+          f"({_kb(gz_sizes[-1])} gzip)")
+    print("\n⏱️  Startup parse (measured in Python)")
+    print(f"  Before: {startup_before:.1f} ms for all {VERSE_COUNT} verses at module load")
+    print(f"  After:  0 ms at load; {startup_after:.2f} ms per median shard on demand, "
+          f"no per-render span building")
+
+
+def build(annotations_path, text_path=DEFAULT_TEXT_PATH, output_dir=DEFAULT_OUTPUT_DIR,
+          skip_invalid=False):
+    """Validate, resolve and write tajweed shards; returns the shards"""
+    verses = load_quran_text(text_path)
+    annotations = load_annotations(annotations_path)
+
+    errors, warnings = validate(verses, annotations)
+    for msg in warnings:
+        print(f"  ⚠️  {msg}")
+    for msg in errors[:20]:
+        print(f"  ❌ {msg}")
+    if len(errors) > 20:
+        print(f"  ... {len(errors) - 20} more errors")
+
+    if errors and not skip_invalid:
+        raise ValueError(f"{len(errors)} invalid annotations (use --skip-invalid to drop them)")
+
+    # Out-of-range annotations are dropped at render time anyway; drop them here too
+    annotations = {
+        key: [a for a in anns if 0 <= a['start'] < a['end'] <= len(verses[key])]
+        for key, anns in annotations.items() if key in verses
+    }
+
+    shards = build_shards(verses, annotations)
+    if len(shards) != SURAH_COUNT:
+        raise ValueError(f"built {len(shards)} surah shards, expected {SURAH_COUNT}")
+
+    written = write_shards(shards, output_dir)
+    print(f"✅ Wrote {len(written)} tajweed shards to {output_dir}")
+
+    report(annotations_path, text_path, written)
+    return shards
+
+
+if __name__ == "__main__":
+    import sys
+    build(sys.argv[1])
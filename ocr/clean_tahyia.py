@@ -69,16 +69,23 @@ def clean_book(input_path, output_path=None):
     print(f"  Total lines removed: {total_removed}")
     return data
 
-if __name__ == "__main__":
-    base_path = Path(__file__).parent.parent / "public" / "arabic" / "books"
+DEFAULT_BOOKS_DIR = Path(__file__).parent.parent / "public" / "arabic" / "books"
+DEFAULT_BOOK_FILES = ['aby-t2.json', 'aby-t3.json']
+
+def main(paths=None):
+    """Clean tahyia from the given books (default: ABY T2/T3)"""
+    if paths is None:
+        paths = [DEFAULT_BOOKS_DIR / name for name in DEFAULT_BOOK_FILES]
 
     print("🧹 Cleaning tahyia sections from ABY books...\n")
 
-    for book_file in ['aby-t2.json', 'aby-t3.json']:
-        path = base_path / book_file
+    for path in map(Path, paths):
         if path.exists():
-            print(f"📖 Processing {book_file}...")
+            print(f"📖 Processing {path.name}...")
             clean_book(path)
             print()
 
     print("✅ Cleaning complete!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the ABY book pipeline
+
+    python -m ocr ocr        OCR page images into output/unit_<n>.json
+    python -m ocr translate  Fill missing French translations in unit files
+    python -m ocr assemble   Build the book JSON from unit files
+    python -m ocr convert    Convert legacy ABY JSON to universal format
+    python -m ocr clean      Remove tahyia sections from book JSON
+    python -m ocr tajweed    Precompute per-surah tajweed shards for the Quran module
+
+Only argparse is imported at startup; each command imports what it needs
+(requests/dotenv only for the commands that call Gemini).
+"""
+
+import argparse
+
+
+def _client(args):
+    from .gemini import GeminiClient, GeminiConfig
+    overrides = {'model': args.model} if args.model else {}
+    try:
+        return GeminiClient(GeminiConfig.from_env(args.env_file, **overrides))
+    except RuntimeError as e:
+        raise SystemExit(f"error: {e}")
+
+
+def cmd_ocr(args):
+    from pathlib import Path
+    from . import aby_t3_ocr as pipeline
+
+    client = _client(args)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(exist_ok=True)
+
+    units_images = pipeline.group_unit_images(args.images_dir)
+    if args.unit:
+        units_images = {n: imgs for n, imgs in units_images.items() if n in args.unit}
+    print(f"Found {len(units_images)} units to process")
+
+    for unit_num in sorted(units_images):
+        unit_data = pipeline.ocr_unit(client, unit_num, sorted(units_images[unit_num]), args.delay)
+        if args.translate:
+            pipeline.translate_unit(client, unit_data, args.delay)
+        pipeline.save_unit(unit_data, output_dir)
+
+
+def cmd_translate(args):
+    from . import aby_t3_ocr as pipeline
+
+    client = _client(args)
+    for unit_data in pipeline.load_units(args.output_dir):
+        if args.unit and unit_data['id'] not in args.unit:
+            continue
+        print(f"Unit {unit_data['id']}")
+        pipeline.translate_unit(client, unit_data, args.delay)
+        pipeline.save_unit(unit_data, args.output_dir)
+
+
+def cmd_assemble(args):
+    from . import aby_t3_ocr as pipeline
+
+    units = pipeline.load_units(args.output_dir)
+    print(f"Found {len(units)} units")
+    if units:
+        pipeline.build_book_json(units, args.book)
+
+
+def cmd_convert(args):
+    from .convert_to_universal import main
+    main(args.base_path)
+
+
+def cmd_clean(args):
+    from .clean_tahyia import main
+    main(args.books or None)
+
+
+def cmd_tajweed(args):
+    from .build_tajweed import build
+    try:
+        build(args.annotations, args.text, args.output_dir, args.skip_invalid)
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+
+
+def build_parser():
+    # Default paths are resolved here without importing the pipeline modules
+    from os.path import dirname, join
+    ocr_dir = dirname(__file__)
+    root_dir = dirname(ocr_dir)
+    output_dir = join(ocr_dir, 'output')
+
+    parser = argparse.ArgumentParser(prog='python -m ocr', description='ABY book pipeline')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gemini = argparse.ArgumentParser(add_help=False)
+    gemini.add_argument('--env-file', default=join(root_dir, '.env'),
+                        help='.env file with GOOGLE_API_KEY (default: repo root)')
+    gemini.add_argument('--model', help='Gemini model name (default: gemini-2.0-flash)')
+    gemini.add_argument('--delay', type=float, default=0.5,
+                        help='seconds between API calls (rate limiting)')
+    gemini.add_argument('--unit', type=int, action='append',
+                        help='only process this unit (repeatable)')
+
+    p = sub.add_parser('ocr', parents=[gemini], help='OCR page images into unit files')
+    p.add_argument('--images-dir', default=join(root_dir, 'ABY OCR'))
+    p.add_argument('--output-dir', default=output_dir)
+    p.add_argument('--translate', action='store_true', help='also translate each unit')
+    p.set_defaults(func=cmd_ocr)
+
+    p = sub.add_parser('translate', parents=[gemini], help='translate unit files')
+    p.add_argument('--output-dir', default=output_dir)
+    p.set_defaults(func=cmd_translate)
+
+    p = sub.add_parser('assemble', help='build the book JSON from unit files')
+    p.add_argument('--output-dir', default=output_dir)
+    p.add_argument('--book', default=join(root_dir, 'public', 'arabic', 'books', 'aby-t3.json'))
+    p.set_defaults(func=cmd_assemble)
+
+    p = sub.add_parser('convert', help='convert legacy ABY JSON to universal format')
+    p.add_argument('--base-path', default=join(root_dir, 'public', 'arabic'))
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser('clean', help='remove tahyia sections from book JSON')
+    p.add_argument('books', nargs='*', help='book JSON files (default: ABY T2/T3)')
+    p.set_defaults(func=cmd_clean)
+
+    quran_dir = join(root_dir, 'src', 'modules', 'quran')
+    p = sub.add_parser('tajweed', help='precompute per-surah tajweed shards')
+    p.add_argument('annotations', help='cpfair/quran-tajweed annotation JSON')
+    p.add_argument('--text', default=join(quran_dir, 'data', 'quran-uthmani.txt'))
+    p.add_argument('--output-dir', default=join(root_dir, 'public', 'quran-tajweed'))
+    p.add_argument('--skip-invalid', action='store_true',
+                   help='drop annotations that do not fit the text instead of failing')
+    p.set_defaults(func=cmd_tajweed)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -129,8 +129,11 @@ def convert_aby_t2_t3(input_path, output_path, book_id, title):
 
     print(f"✅ Converted {book_id.upper()} → {output_path}")
 
-if __name__ == "__main__":
-    base_path = Path(__file__).parent.parent / "public" / "arabic"
+DEFAULT_BASE_PATH = Path(__file__).parent.parent / "public" / "arabic"
+
+def main(base_path=DEFAULT_BASE_PATH):
+    """Convert ABY T1/T2/T3 from base_path into base_path/books"""
+    base_path = Path(base_path)
     books_path = base_path / "books"
     books_path.mkdir(exist_ok=True)
 
@@ -157,3 +160,6 @@ if __name__ == "__main__":
     )
 
     print("\n🎉 All conversions complete!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Gemini client for the ABY OCR pipeline
+- Explicit config object (no environment reads at import time)
+- `requests` is imported lazily, on the first API call
+"""
+
+import os
+import base64
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_ENV_PATH = Path(__file__).parent.parent / '.env'
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+OCR_PROMPT = """Extrais TOUT le texte arabe de cette image.
+Le texte contient des paragraphes numérotés avec des chiffres arabes (١، ٢، ٣...).
+Retourne UNIQUEMENT le texte arabe tel qu'il apparaît, avec les numéros.
+Ne traduis pas. Ne commente pas. Juste le texte arabe brut."""
+
+TITLE_PROMPT = """Cette image est une page de titre d'un livre arabe.
+Extrais UNIQUEMENT le titre principal (pas "الوحدة الأولى" etc).
+Le titre est généralement en gros au centre.
+Retourne juste le titre arabe, rien d'autre."""
+
+TRANSLATE_PROMPT = """Traduis ce texte arabe en français.
+Garde le sens exact et le style académique/religieux.
+Les références coraniques [sourate:verset] doivent rester entre crochets.
+Retourne UNIQUEMENT la traduction française, rien d'autre.
+
+Texte arabe:
+{text}"""
+
+
+@dataclass
+class GeminiConfig:
+    """Settings for talking to the Gemini API"""
+    api_key: str
+    model: str = 'gemini-2.0-flash'
+    base_url: str = GEMINI_BASE_URL
+    timeout: float = 120.0
+
+    @classmethod
+    def from_env(cls, env_path=DEFAULT_ENV_PATH, **overrides):
+        """Build a config from GOOGLE_API_KEY (optionally loaded from a .env file)"""
+        if env_path is not None and Path(env_path).exists():
+            from dotenv import load_dotenv
+            load_dotenv(env_path)
+
+        api_key = os.getenv('GOOGLE_API_KEY')
+        if not api_key:
+            raise RuntimeError('GOOGLE_API_KEY is not set (environment or .env)')
+        return cls(api_key=api_key, **overrides)
+
+    @property
+    def url(self):
+        return f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
+
+
+def _image_part(image_path):
+    with open(image_path, 'rb') as f:
+        image_data = base64.b64encode(f.read()).decode('utf-8')
+    return {"inline_data": {"mime_type": "image/png", "data": image_data}}
+
+
+class GeminiClient:
+    """OCR and translation calls over a reused HTTP session"""
+
+    def __init__(self, config):
+        self.config = config
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def generate(self, parts, temperature=0.1, max_tokens=8192, label='Gemini'):
+        """Send a generateContent request and return the first candidate's text"""
+        payload = {
+            "contents": [{"parts": parts}],
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens
+            }
+        }
+
+        response = self.session.post(self.config.url, json=payload, timeout=self.config.timeout)
+        result = response.json()
+
+        if 'candidates' in result:
+            return result['candidates'][0]['content']['parts'][0]['text']
+
+        if 'error' in result:
+            print(f"    {label} Error: {result['error'].get('message', 'Unknown')}")
+        return ''
+
+    def ocr_image(self, image_path):
+        """Extract Arabic text from image using Gemini Vision"""
+        return self.generate([{"text": OCR_PROMPT}, _image_part(image_path)],
+                             temperature=0.1, max_tokens=8192, label='OCR')
+
+    def ocr_title_page(self, image_path):
+        """Extract title from title page image"""
+        return self.generate([{"text": TITLE_PROMPT}, _image_part(image_path)],
+                             temperature=0.1, max_tokens=256, label='Title').strip()
+
+    def translate(self, arabic_text):
+        """Translate Arabic text to French using Gemini"""
+        if not arabic_text.strip():
+            return ''
+        return self.generate([{"text": TRANSLATE_PROMPT.format(text=arabic_text)}],
+                             temperature=0.2, max_tokens=4096, label='Translation').strip()
@@ -0,0 +1,70 @@
+"""
+Parsing helpers for OCR output (pure functions, stdlib only)
+"""
+
+import re
+
+# Arabic numeral mapping
+AR_NUMERALS = {'٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+               '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9'}
+
+PARAGRAPH_START_RE = re.compile(r'^([١٢٣٤٥٦٧٨٩٠]+)\s*[-–:]\s*(.*)$')
+NUMBERED_LINE_RE = re.compile(r'[١٢٣٤٥٦٧٨٩٠]-')
+ARABIC_RUN_RE = re.compile(r'[\u0600-\u06FF]{10,}')
+
+
+def arabic_to_int(ar_num):
+    """Convert Arabic numerals to integer"""
+    result = ''
+    for char in ar_num:
+        result += AR_NUMERALS.get(char, char)
+    return int(result) if result.isdigit() else 0
+
+
+def parse_paragraphs(raw_text):
+    """Parse text into numbered paragraphs"""
+    paragraphs = []
+
+    # Clean up any introductory text from Gemini
+    lines = raw_text.split('\n')
+
+    # Skip any non-Arabic introductory lines
+    start_idx = 0
+    for i, line in enumerate(lines):
+        if NUMBERED_LINE_RE.search(line) or ARABIC_RUN_RE.search(line):
+            start_idx = i
+            break
+
+    lines = lines[start_idx:]
+    current_paragraph = {'num': 0, 'ar': '', 'is_header': False}
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Check for numbered paragraph start (e.g., "١-" or "٢-")
+        num_match = PARAGRAPH_START_RE.match(line)
+
+        if num_match:
+            # Save previous paragraph if exists
+            if current_paragraph['ar']:
+                paragraphs.append(current_paragraph.copy())
+
+            num = arabic_to_int(num_match.group(1))
+            text = num_match.group(2)
+            current_paragraph = {'num': num, 'ar': text, 'is_header': False}
+        else:
+            # Continue current paragraph
+            if current_paragraph['ar']:
+                current_paragraph['ar'] += ' ' + line
+            else:
+                # Could be a header/title
+                current_paragraph['ar'] = line
+                current_paragraph['is_header'] = len(line) < 60 and ':' in line
+
+    # Don't forget last paragraph
+    if current_paragraph['ar']:
+        paragraphs.append(current_paragraph)
+
+    return paragraphs
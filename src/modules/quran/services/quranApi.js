@@ -1,7 +1,7 @@
 // Quran API Service
 // Uses AlQuran.cloud for text, cpfair/quran-tajweed for accurate tajweed, and EveryAyah/Islamic Network CDN for audio
 
-import { getVerseWithTajweed, hasTajweedData, getCpfairText, getVerseWordsWithTajweed } from './tajweed'
+import { getVerseWithTajweed, hasTajweedData, getVerseWordsWithTajweed, loadTajweedSurahs } from './tajweed'
 
 const TEXT_API_BASE = 'https://api.alquran.cloud/v1';
 const QURAN_COM_API = 'https://api.quran.com/api/v4';
@@ -100,6 +100,7 @@ export async function getPage(pageNumber, useTajweed = false, options = {}) {
 
     // Apply cpfair tajweed if enabled - uses cpfair's own text for accurate positions
     if (useTajweed && data.data && data.data.ayahs) {
+      await loadTajweedSurahs(data.data.ayahs.map(ayah => ayah.surah.number));
       data.data.ayahs = data.data.ayahs.map(ayah => {
         if (hasTajweedData(ayah.surah.number, ayah.numberInSurah)) {
           const tajweedText = getVerseWithTajweed(ayah.surah.number, ayah.numberInSurah);
@@ -267,6 +268,11 @@ export async function getPageWithLines(pageNumber, useTajweed = false, options =
     if (!response.ok) throw new Error('Failed to fetch page with lines');
     const data = await response.json();
 
+    // Load precomputed tajweed shards for the surahs on this page
+    if (useTajweed) {
+      await loadTajweedSurahs(data.verses.map(verse => parseInt(verse.verse_key.split(':')[0])));
+    }
+
     // Build line-by-line structure for Mushaf-style display
     const linesMap = new Map();
     for (let i = 1; i <= 15; i++) {
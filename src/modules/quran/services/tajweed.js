@@ -2,13 +2,14 @@
  * cpfair/quran-tajweed Integration Service
  * Provides accurate letter-level tajweed annotations
  * Source: https://github.com/cpfair/quran-tajweed
+ *
+ * Verses are precomputed per surah by `python -m ocr tajweed` (see ocr/build_tajweed.py)
+ * into public/quran-tajweed/<surah>.json with per-word tajweed HTML already resolved.
+ * Shards are fetched on demand with loadTajweedSurahs(); lookups below are synchronous.
  */
 
-// Import data files
-import tajweedData from '../data/tajweed-cpfair.json'
-import quranTextRaw from '../data/quran-uthmani.txt?raw'
-
-// Map cpfair rule names to CSS classes and colors
+// Map cpfair rule names to CSS classes and colors (legend)
+// Keep in sync with ocr/build_tajweed.py and the .tj-* rules in index.css
 export const TAJWEED_RULES = {
   // Silent/Non-pronounced letters - GRAY
   hamzat_wasl: { class: 'hamzat_wasl', color: '#AAAAAA', name: 'Hamzat al-Wasl' },
@@ -43,99 +44,64 @@ export const TAJWEED_RULES = {
   iqlab: { class: 'iqlab', color: '#58B800', name: 'Iqlab' },
 }
 
-// Build an index for fast lookup: { "surah:ayah": annotations }
-const tajweedIndex = {}
-tajweedData.forEach(item => {
-  const key = `${item.surah}:${item.ayah}`
-  tajweedIndex[key] = item.annotations || []
-})
-
-// Parse the cpfair Quran text file and build index: { "surah:ayah": text }
-const quranTextIndex = {}
-quranTextRaw.split('\n').forEach(line => {
-  if (!line.trim()) return
-  const parts = line.split('|')
-  if (parts.length >= 3) {
-    const surah = parseInt(parts[0])
-    const ayah = parseInt(parts[1])
-    const text = parts.slice(2).join('|').trim() // Trim to remove \r and whitespace
-    const key = `${surah}:${ayah}`
-    quranTextIndex[key] = text
-  }
-})
+// Cache of loaded shards: { surah: [{ t: text, w: [html|null per word] }] }
+const shardCache = {}
+// In-flight shard requests (to avoid fetching the same surah twice)
+const pendingShards = {}
 
 /**
- * Get the cpfair text for a specific verse
- * This is the text that matches the tajweed annotation positions
+ * Load precomputed tajweed shards for the given surahs
+ * @param {Array<number>} surahNumbers - Surah numbers (1-114)
+ * @returns {Promise<void>}
  */
-export function getCpfairText(surah, ayah) {
-  const key = `${surah}:${ayah}`
-  return quranTextIndex[key] || null
+export async function loadTajweedSurahs(surahNumbers) {
+  await Promise.all([...new Set(surahNumbers)].map(surah => {
+    if (shardCache[surah]) return null
+
+    if (!pendingShards[surah]) {
+      pendingShards[surah] = fetch(`/quran-tajweed/${surah}.json`)
+        .then(response => {
+          if (!response.ok) throw new Error(`Failed to fetch tajweed shard: ${response.status}`)
+          return response.json()
+        })
+        .then(shard => {
+          shardCache[surah] = shard.ayahs
+        })
+        .catch(error => {
+          console.error(`Error loading tajweed for surah ${surah}:`, error)
+        })
+        .finally(() => {
+          delete pendingShards[surah]
+        })
+    }
+    return pendingShards[surah]
+  }))
 }
 
-/**
- * Get tajweed annotations for a specific verse
- * @param {number} surah - Surah number (1-114)
- * @param {number} ayah - Ayah number
- * @returns {Array} Array of annotations with rule, start, end
- */
-export function getTajweedAnnotations(surah, ayah) {
-  const key = `${surah}:${ayah}`
-  return tajweedIndex[key] || []
+function getShardAyah(surah, ayah) {
+  const ayahs = shardCache[surah]
+  return ayahs ? ayahs[ayah - 1] || null : null
 }
 
 /**
- * Apply tajweed annotations to text
- * Returns HTML string with <span> tags for each rule
- * @param {string} text - Plain Arabic text (should be cpfair text for accurate positions)
- * @param {Array} annotations - Array of {rule, start, end}
- * @returns {string} HTML string with tajweed markup
+ * Get the cpfair text for a specific verse
+ * This is the text that matches the tajweed annotation positions
  */
-export function applyTajweedToText(text, annotations) {
-  if (!annotations || annotations.length === 0) {
-    return text
-  }
-
-  // Sort annotations by start position (descending) to apply from end to start
-  // This prevents position shifts when inserting tags
-  const sorted = [...annotations].sort((a, b) => b.start - a.start)
-
-  // Convert text to array of characters for manipulation
-  let chars = [...text]
-
-  for (const ann of sorted) {
-    const rule = TAJWEED_RULES[ann.rule]
-    if (!rule) continue
-
-    // Get the characters to wrap
-    const start = ann.start
-    const end = ann.end
-
-    if (start >= 0 && end <= chars.length && start < end) {
-      const segment = chars.slice(start, end).join('')
-      const wrapped = `<span class="tj-${rule.class}" style="color:${rule.color}">${segment}</span>`
-
-      // Replace the segment
-      chars.splice(start, end - start, wrapped)
-    }
-  }
-
-  return chars.join('')
+export function getCpfairText(surah, ayah) {
+  const entry = getShardAyah(surah, ayah)
+  return entry ? entry.t : null
 }
 
 /**
- * Get verse with tajweed HTML applied using cpfair's own text
- * This ensures proper alignment of tajweed annotations
+ * Get verse with tajweed HTML using cpfair's own text
+ * The surah must have been loaded with loadTajweedSurahs()
  * @param {number} surah - Surah number
  * @param {number} ayah - Ayah number
  * @returns {string|null} HTML string with tajweed markup, or null if not available
  */
 export function getVerseWithTajweed(surah, ayah) {
-  const text = getCpfairText(surah, ayah)
-  if (!text) return null
-
-  const annotations = getTajweedAnnotations(surah, ayah)
-  return applyTajweedToText(text, annotations)
+  const words = getVerseWordsWithTajweed(surah, ayah, false)
+  return words ? words.map(w => w.html).join(' ') : null
 }
 
 /**
@@ -150,15 +116,15 @@ export function getTajweedLegend() {
 }
 
 /**
- * Check if cpfair tajweed data is available for a verse
+ * Check if cpfair tajweed data is loaded for a verse
  */
 export function hasTajweedData(surah, ayah) {
-  const key = `${surah}:${ayah}`
-  return key in tajweedIndex && key in quranTextIndex
+  const entry = getShardAyah(surah, ayah)
+  return !!(entry && entry.w)
 }
 
 /**
- * Build word-level tajweed data for a verse
+ * Get word-level tajweed data for a verse
  * Returns an array of words with their tajweed HTML applied
  * @param {number} surah - Surah number
  * @param {number} ayah - Ayah number
@@ -166,51 +132,21 @@ export function hasTajweedData(surah, ayah) {
  * @returns {Array|null} Array of {text, html} for each word, or null if not available
  */
 export function getVerseWordsWithTajweed(surah, ayah, skipBismillah = true) {
-  const text = getCpfairText(surah, ayah)
-  if (!text) return null
-
-  const annotations = getTajweedAnnotations(surah, ayah)
+  const entry = getShardAyah(surah, ayah)
+  if (!entry) return null
 
-  // Split text into words (by spaces)
-  let words = text.split(/\s+/).filter(w => w.length > 0)
+  const html = entry.w || []
+  let result = entry.t.split(' ').map((word, i) => ({
+    text: word,
+    html: html[i] || word
+  }))
 
   // cpfair data includes Bismillah in verse 1 of surahs 2-114 (except 9)
   // But Quran.com API separates Bismillah from the verse
   // We need to skip the Bismillah words (4 words) for proper alignment
-  let charOffset = 0
   const bismillahWordCount = 4 // "بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ"
-
   if (skipBismillah && ayah === 1 && surah > 1 && surah !== 9) {
-    // Skip first 4 words and calculate their character offset
-    for (let i = 0; i < bismillahWordCount && i < words.length; i++) {
-      charOffset += [...words[i]].length + 1 // +1 for space
-    }
-    words = words.slice(bismillahWordCount)
-  }
-
-  const result = []
-
-  for (const word of words) {
-    const wordLength = [...word].length
-    const wordEnd = charOffset + wordLength
-
-    // Get annotations that overlap with this word
-    const wordAnnotations = annotations
-      .filter(ann => ann.start < wordEnd && ann.end > charOffset)
-      .map(ann => ({
-        ...ann,
-        start: Math.max(0, ann.start - charOffset),
-        end: Math.min(wordLength, ann.end - charOffset)
-      }))
-
-    const html = applyTajweedToText(word, wordAnnotations)
-    result.push({
-      text: word,
-      html: html
-    })
-
-    // Move offset: word length + 1 for space
-    charOffset = wordEnd + 1
+    result = result.slice(bismillahWordCount)
   }
 
   return result
@@ -265,6 +201,3 @@ export function applyTajweedToWords(surah, ayah, quranComWords) {
 
   return result
 }
-
-// Export the raw indexes for debugging
-export { tajweedIndex, quranTextIndex }